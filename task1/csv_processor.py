@@ -1,18 +1,33 @@
 import csv
 import os
+import tempfile
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Set, Dict, Tuple
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Set, Dict, Tuple, Iterator, Callable, Optional, Sequence, Union
 
-import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.feather as feather
 
+_CHUNK_SIZE = 100_000
+_BUFFER_SIZE = 1 << 20
+# Stored in the Feather cache metadata; bump it whenever the CSV reader options change.
+_CACHE_VERSION = b'3'
 
-def _validate_csv_and_columns(csv_file: str, required_columns: List[str]) -> None:
+
+@contextmanager
+def _open_and_validate(csv_file: str, required_columns: List[str]) -> Iterator[Tuple[List[str], Iterator[List[str]]]]:
     """
-        Validate the CSV file and check for required columns.
+        Open the CSV file once, validate its header and yield a reader positioned past it.
 
         This function ensures that the specified CSV file exists, has the correct file extension,
-        and contains all the required columns. It raises a ValueError for any validation issues.
+        and contains all the required columns. The same file handle is then reused by the caller
+        to stream the data rows, so the header is parsed only once per call.
 
         Parameters:
         -----------
@@ -21,6 +36,12 @@ def _validate_csv_and_columns(csv_file: str, required_columns: List[str]) -> Non
         required_columns : List[str]
             A list of required column names that must be present in the CSV file.
 
+        Yields:
+        -------
+        Tuple[List[str], Iterator[List[str]]]
+            The header row and a `csv.reader` positioned past it. Rows are plain lists,
+            so callers look values up by `header.index(column)`.
+
         Raises:
         -------
         ValueError
@@ -33,19 +54,260 @@ def _validate_csv_and_columns(csv_file: str, required_columns: List[str]) -> Non
         raise ValueError(f"The file '{csv_file}' is not a valid CSV file.")
 
     try:
-        with open(csv_file, mode='r', newline='') as file:
-            reader = csv.DictReader(file)
-            if not reader.fieldnames:
-                raise ValueError(f"The CSV file '{csv_file}' is empty.")
-
-            for column in required_columns:
-                if not column or column.strip() == "":
-                    raise ValueError("The target column name cannot be empty or null.")
-                if column not in reader.fieldnames:
-                    raise ValueError(f"The specified column '{column}' does not exist in the CSV file.")
+        file = open(csv_file, mode='r', newline='', encoding='utf-8', buffering=_BUFFER_SIZE)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"The file '{csv_file}' does not exist.")
+
+    with file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        _check_header(csv_file, header, required_columns)
+        yield header, reader
+
+
+def _check_header(csv_file: str, header: Optional[Sequence[str]], required_columns: List[str]) -> None:
+    """
+        Check that the CSV header is present and contains all the required columns.
+
+        Raises:
+        -------
+        ValueError
+            If the header is empty, the required columns are not present,
+            or if the required column names are empty or invalid.
+        """
+    if not header:
+        raise ValueError(f"The CSV file '{csv_file}' is empty.")
+
+    header_columns = set(header)
+    for column in required_columns:
+        if not column or column.strip() == "":
+            raise ValueError("The target column name cannot be empty or null.")
+        if column not in header_columns:
+            raise ValueError(f"The specified column '{column}' does not exist in the CSV file.")
+
+
+@lru_cache(maxsize=128)
+def _read_header(csv_path: str, mtime_ns: int) -> Tuple[str, ...]:
+    """
+        Read the header row of a CSV file, memoized by absolute path and modification time.
+
+        A change to the file updates its modification time, so stale entries are never hit.
+        """
+    with open(csv_path, mode='r', newline='', encoding='utf-8') as file:
+        return tuple(next(csv.reader(file), None) or ())
+
+
+def _validate_csv_and_columns(csv_file: str, required_columns: List[str]) -> None:
+    """
+        Validate the CSV file and check for required columns.
+
+        Used by the pandas based functions, which read the file on their own. The header is
+        read once per file version, so repeated queries against the same file do not reopen it.
+        See `_open_and_validate` for the checks performed.
+        """
+    if not csv_file.lower().endswith('.csv'):
+        raise ValueError(f"The file '{csv_file}' is not a valid CSV file.")
+
+    try:
+        mtime_ns = os.stat(csv_file).st_mtime_ns
     except FileNotFoundError:
         raise FileNotFoundError(f"The file '{csv_file}' does not exist.")
 
+    _check_header(csv_file, _read_header(os.path.abspath(csv_file), mtime_ns), required_columns)
+
+
+def _load_cached(csv_file: str) -> pa.Table:
+    """
+        Load a CSV file as an Arrow table, caching it as a Feather file next to the CSV.
+
+        The CSV is parsed by PyArrow's multithreaded CSV reader only when the cache file
+        `<csv_file>.feather` is missing or was built from a different version of the CSV. The size
+        and modification time (in nanoseconds) of the source are stored in the cache's schema
+        metadata and must match exactly, so a CSV replaced by a file with an older modification
+        time is parsed again, as is a cache written with different reader options. Otherwise the cached table is memory-mapped, so repeated queries
+        against the same file skip parsing altogether.
+        All columns are read as strings so values keep their textual form, and only empty cells
+        are read as nulls. Quoted values may contain newlines, and rows with fewer fields than the
+        header are skipped.
+
+        Parameters:
+        -----------
+        csv_file : str
+            The path to the CSV file to be loaded.
+
+        Returns:
+        --------
+        pa.Table
+            A table holding every column of the CSV file.
+
+        Notes:
+        ------
+        - If the cache file cannot be written, the parsed table is returned without caching, and an unreadable
+          cache file is rebuilt.
+        """
+    cache_file = csv_file + '.feather'
+    stat = os.stat(csv_file)
+    source = {b'source_size': str(stat.st_size).encode(), b'source_mtime_ns': str(stat.st_mtime_ns).encode(),
+              b'cache_version': _CACHE_VERSION}
+    if os.path.exists(cache_file):
+        try:
+            table = feather.read_table(cache_file, memory_map=True)
+            if all((table.schema.metadata or {}).get(key) == value for key, value in source.items()):
+                return table
+        except (OSError, pa.ArrowInvalid):
+            pass
+
+    header = _read_header(os.path.abspath(csv_file), stat.st_mtime_ns)
+    # Only empty cells are nulls; literals such as 'NA' or 'null' are kept as text, like the csv module does.
+    convert_options = pacsv.ConvertOptions(column_types={column: pa.string() for column in header},
+                                           strings_can_be_null=True, null_values=[''])
+    # Quoted values may span lines, so block boundaries must not be placed inside them.
+    parse_options = pacsv.ParseOptions(newlines_in_values=True, invalid_row_handler=_skip_short_row)
+    table = pacsv.read_csv(csv_file, parse_options=parse_options,
+                           convert_options=convert_options).replace_schema_metadata(source)
+
+    # A unique temp file per writer keeps concurrent threads or processes from replacing a half-written cache.
+    try:
+        fd, temp_file = tempfile.mkstemp(dir=os.path.dirname(cache_file) or '.', suffix='.feather.tmp')
+        os.close(fd)
+    except OSError:
+        return table
+    try:
+        feather.write_feather(table, temp_file, compression='uncompressed')
+        os.replace(temp_file, cache_file)
+    except OSError:
+        os.remove(temp_file)
+    return table
+
+
+def _skip_short_row(row: pacsv.InvalidRow) -> str:
+    """
+        Skip rows with fewer fields than the header when parsing with PyArrow, like the csv based functions.
+
+        Rows with more fields than the header are still reported as errors.
+        """
+    return 'skip' if row.actual_columns < row.expected_columns else 'error'
+
+
+def _read_table(csv_file: str, columns: List[str]) -> pa.Table:
+    """
+        Read the given columns of a CSV file into an Arrow table.
+
+        Parameters:
+        -----------
+        csv_file : str
+            The path to the CSV file to be read.
+        columns : List[str]
+            The columns to be loaded.
+
+        Returns:
+        --------
+        pa.Table
+            A table holding only the requested columns.
+        """
+    return _load_cached(csv_file).select(columns)
+
+
+def _normalize_column(column: Union[pa.Array, pa.ChunkedArray], normalize: bool,
+                      lowercase: bool) -> Union[pa.Array, pa.ChunkedArray]:
+    """
+        Trim, optionally normalize and lowercase an Arrow string column with compute kernels.
+
+        Parameters:
+        -----------
+        column : Union[pa.Array, pa.ChunkedArray]
+            The string column to be processed.
+        normalize : bool
+            If True, removes spaces from the values.
+        lowercase : bool
+            If True, converts the values to lowercase.
+
+        Returns:
+        --------
+        Union[pa.Array, pa.ChunkedArray]
+            The processed column.
+        """
+    column = pc.utf8_trim_whitespace(column)
+    if normalize:
+        column = pc.replace_substring(column, pattern=" ", replacement="")
+    if lowercase:
+        column = pc.utf8_lower(column)
+    return column
+
+
+def _count_groups(table: pa.Table, group_by_columns: List[str], normalize: bool, lowercase: bool) -> pa.Table:
+    """
+        Count unique combinations of values across the given columns of an Arrow table.
+
+        The table is processed in record batches of at most `_CHUNK_SIZE` rows. In each batch the
+        grouping columns are dictionary-encoded, only the (small) dictionaries are normalized, and
+        rows are grouped on the integer codes. The codes are then mapped back to the normalized
+        strings, and the partial counts are merged at the end, so peak memory is bounded by the
+        batch size and the number of groups.
+
+        Parameters:
+        -----------
+        table : pa.Table
+            The table holding the grouping columns as strings.
+        group_by_columns : List[str]
+            The list of column names used for grouping.
+        normalize : bool
+            If True, removes spaces from the values before grouping.
+        lowercase : bool
+            If True, converts the values to lowercase before grouping.
+
+        Returns:
+        --------
+        pa.Table
+            A table with the grouping columns and a 'count' column, sorted in descending order of counts.
+        """
+    partial_counts = []
+    for batch in table.select(group_by_columns).to_batches(max_chunksize=_CHUNK_SIZE):
+        codes, dictionaries = {}, {}
+        for column in group_by_columns:
+            encoded = pc.dictionary_encode(pc.fill_null(batch.column(column), ""))
+            codes[column] = encoded.indices
+            dictionaries[column] = _normalize_column(encoded.dictionary, normalize, lowercase)
+
+        # Distinct codes may normalize to the same value; the final aggregation merges them.
+        batch_counts = pa.table(codes).group_by(group_by_columns).aggregate([([], 'count_all')])
+        partial_counts.append(pa.table({
+            **{column: pc.take(dictionaries[column], batch_counts.column(column)) for column in group_by_columns},
+            'count_all': batch_counts.column('count_all'),
+        }))
+
+    if not partial_counts:
+        return pa.table({**{column: pa.array([], pa.string()) for column in group_by_columns},
+                         'count': pa.array([], pa.int64())})
+
+    count_data = pa.concat_tables(partial_counts).group_by(group_by_columns).aggregate([('count_all', 'sum')])
+    count_data = pa.table({**{column: count_data.column(column) for column in group_by_columns},
+                           'count': count_data.column('count_all_sum')})
+    return count_data.sort_by([('count', 'descending')])
+
+
+def _normalizer(normalize: bool, lowercase: bool) -> Callable[[str], str]:
+    """
+        Return the function used to normalize grouping values in the csv based functions.
+
+        Parameters:
+        -----------
+        normalize : bool
+            If True, the returned function removes spaces from the values.
+        lowercase : bool
+            If True, the returned function removes spaces and converts the values to lowercase.
+
+        Returns:
+        --------
+        Callable[[str], str]
+            The normalization function.
+        """
+    if lowercase:
+        return lambda value: value.replace(" ", "").lower()
+    if normalize:
+        return lambda value: value.replace(" ", "")
+    return lambda value: value
+
 
 def extract_unique_values(csv_file: str, target_column: str, normalize: bool = True, lowercase: bool = False) -> List[
     str]:
@@ -83,21 +345,21 @@ def extract_unique_values(csv_file: str, target_column: str, normalize: bool = T
         ------
         - The returned list is sorted alphabetically.
         """
-    _validate_csv_and_columns(csv_file, [target_column])
-
     unique_values: Set[str] = set()
 
     try:
-        with open(csv_file, mode='r', newline='') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                value = row.get(target_column, "")
-                if value:
-                    if normalize:
-                        value = value.replace(" ", "")
-                    if lowercase:
-                        value = value.lower()
-                    unique_values.add(value)
+        with _open_and_validate(csv_file, [target_column]) as (header, reader):
+            idx = header.index(target_column)
+            raw_values = {row[idx] for row in reader if idx < len(row)}
+        raw_values.discard("")
+
+        # Normalize each distinct raw value once instead of every cell.
+        for value in raw_values:
+            if normalize:
+                value = value.replace(" ", "")
+            if lowercase:
+                value = value.lower()
+            unique_values.add(value)
 
         return sorted(unique_values)
     except csv.Error:
@@ -107,10 +369,11 @@ def extract_unique_values(csv_file: str, target_column: str, normalize: bool = T
 def extract_unique_values_pandas(csv_file: str, target_column: str, normalize: bool = True, lowercase: bool = False) -> \
         List[str]:
     """
-        Extract unique values from a target column in a CSV file using pandas.
+        Extract unique values from a target column in a CSV file using pyarrow.
 
-        This function reads a CSV file using pandas and extracts unique values from the specified target column.
-        It optionally normalizes and converts the values to lowercase based on the parameters.
+        This function reads a CSV file using pyarrow and extracts unique values from the specified target column
+        with Arrow compute kernels. It optionally normalizes and converts the values to lowercase based on
+        the parameters.
 
         Parameters:
         -----------
@@ -142,16 +405,12 @@ def extract_unique_values_pandas(csv_file: str, target_column: str, normalize: b
     _validate_csv_and_columns(csv_file, [target_column])
 
     try:
-        df = pd.read_csv(csv_file)
-        unique_values = df[target_column].dropna().astype(str).str.strip()
-
-        if normalize:
-            unique_values = unique_values.str.replace(" ", "", regex=False)
-        if lowercase:
-            unique_values = unique_values.str.lower()
-
-        return sorted(unique_values.unique())
-    except pd.errors.ParserError:
+        table = _read_table(csv_file, [target_column])
+        # Deduplicate before normalizing so the string kernels only run over distinct raw values.
+        raw_values = pc.unique(pc.drop_null(table.column(target_column)))
+        unique_values = pc.unique(_normalize_column(raw_values, normalize, lowercase))
+        return sorted(unique_values.to_pylist())
+    except pa.ArrowInvalid:
         raise ValueError(f"The file '{csv_file}' is not a valid CSV file.")
 
 
@@ -192,21 +451,22 @@ def count_by_columns(csv_file: str, group_by_columns: List[str], normalize: bool
         ------
         - The counts are returned in descending order of frequency.
         """
-    _validate_csv_and_columns(csv_file, group_by_columns)
-
-    count_data = Counter()
+    norm = _normalizer(normalize, lowercase)
     try:
-        with open(csv_file, mode='r', newline='') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                key = tuple(
-                    row[column].replace(" ", "").lower() if lowercase else row[column].replace(" ", "")
-                    if normalize else row[column]
-                    for column in group_by_columns
-                )
-                count_data[key] += 1
-
-        return dict(sorted(count_data.items(), key=lambda item: item[1], reverse=True))
+        with _open_and_validate(csv_file, group_by_columns) as (header, reader):
+            indexes = [header.index(column) for column in group_by_columns]
+            get_key = itemgetter(*indexes)
+            min_length = max(indexes) + 1
+            raw_counts = Counter(map(get_key, (row for row in reader if len(row) >= min_length)))
+
+        # Normalize each distinct raw combination once instead of every cell of every row.
+        # itemgetter returns a bare value rather than a 1-tuple for a single column.
+        single_column = len(group_by_columns) == 1
+        count_data = Counter()
+        for raw_key, count in raw_counts.items():
+            count_data[(norm(raw_key),) if single_column else tuple(map(norm, raw_key))] += count
+
+        return dict(count_data.most_common())
     except csv.Error:
         raise ValueError(f"The file '{csv_file}' is not a valid CSV file.")
 
@@ -215,10 +475,11 @@ def count_by_columns_pandas(csv_file: str, group_by_columns: List[str], normaliz
                             lowercase: bool = False) -> \
         Dict[Tuple[str, ...], int]:
     """
-        Count occurrences of unique combinations of values across specified columns in a CSV file using pandas.
+        Count occurrences of unique combinations of values across specified columns in a CSV file using pyarrow.
 
-        This function reads a CSV file using pandas and counts how often unique combinations of values appear
-        across the specified columns. It optionally normalizes and converts the values to lowercase.
+        This function reads a CSV file using pyarrow and counts how often unique combinations of values appear
+        across the specified columns with Arrow's hash aggregation. It optionally normalizes and converts
+        the values to lowercase.
 
         Parameters:
         -----------
@@ -252,18 +513,10 @@ def count_by_columns_pandas(csv_file: str, group_by_columns: List[str], normaliz
     _validate_csv_and_columns(csv_file, group_by_columns)
 
     try:
-        df = pd.read_csv(csv_file)
-        for column in group_by_columns:
-            df[column] = df[column].astype(str).str.strip()
-            if normalize:
-                df[column] = df[column].str.replace(" ", "", regex=False)
-            if lowercase:
-                df[column] = df[column].str.lower()
-
-        count_data = df.groupby(group_by_columns).size().reset_index(name='count')
-        sorted_count_data = count_data.sort_values(by='count', ascending=False)
-        return {tuple(row[group_by_columns]): row['count'] for _, row in sorted_count_data.iterrows()}
-    except pd.errors.ParserError:
+        count_data = _count_groups(_read_table(csv_file, group_by_columns), group_by_columns, normalize, lowercase)
+        keys = zip(*[count_data.column(column).to_pylist() for column in group_by_columns])
+        return dict(zip(keys, count_data.column('count').to_pylist()))
+    except pa.ArrowInvalid:
         raise ValueError(f"The file '{csv_file}' is not a valid CSV file.")
 
 
@@ -302,12 +555,16 @@ def top_n_values(csv_file: str, target_column: str, n: int = 5, normalize: bool
         FileNotFoundError
             If the specified CSV file does not exist.
         """
-    _validate_csv_and_columns(csv_file, [target_column])
+    norm = _normalizer(normalize, lowercase)
     try:
-        count_data = count_by_columns(csv_file, [target_column], normalize, lowercase)
-        value_counter = Counter({k[0]: v for k, v in count_data.items()})  # Extract the first element of each tuple key
-        top_n = value_counter.most_common(n)
-        return top_n
+        with _open_and_validate(csv_file, [target_column]) as (header, reader):
+            idx = header.index(target_column)
+            raw_counts = Counter(row[idx] for row in reader if idx < len(row))
+
+        value_counter = Counter()
+        for raw_value, count in raw_counts.items():
+            value_counter[norm(raw_value)] += count
+        return value_counter.most_common(n)
     except csv.Error:
         raise ValueError(f"The file '{csv_file}' is not a valid CSV file.")
 
@@ -315,9 +572,9 @@ def top_n_values(csv_file: str, target_column: str, n: int = 5, normalize: bool
 def top_n_values_pandas(csv_file: str, target_column: str, n: int = 5, normalize: bool = True,
                         lowercase: bool = False) -> List[Tuple[str, int]]:
     """
-        Extract the top N most common values from a target column in a CSV file using pandas.
+        Extract the top N most common values from a target column in a CSV file using pyarrow.
 
-        This function reads a CSV file using pandas and extracts the most common values from the specified
+        This function reads a CSV file using pyarrow and extracts the most common values from the specified
         target column. It returns the values along with their respective counts, sorted in descending order
         of frequency. It optionally normalizes and converts the values to lowercase based on the parameters.
 
@@ -350,18 +607,10 @@ def top_n_values_pandas(csv_file: str, target_column: str, n: int = 5, normalize
     _validate_csv_and_columns(csv_file, [target_column])
 
     try:
-        df = pd.read_csv(csv_file)
-        df[target_column] = df[target_column].astype(str).str.strip()
-        if normalize:
-            df[target_column] = df[target_column].str.replace(" ", "", regex=False)
-        if lowercase:
-            df[target_column] = df[target_column].str.lower()
-
-        count_data = df[target_column].value_counts().reset_index()
-        count_data.columns = [target_column, 'count']
-        top_n = count_data.head(n)
-        return list(top_n.itertuples(index=False, name=None))
-    except pd.errors.ParserError:
+        count_data = _count_groups(_read_table(csv_file, [target_column]), [target_column], normalize, lowercase)
+        top_n = count_data.slice(0, n)
+        return list(zip(top_n.column(target_column).to_pylist(), top_n.column('count').to_pylist()))
+    except pa.ArrowInvalid:
         raise ValueError(f"The file '{csv_file}' is not a valid CSV file.")
 
 
@@ -404,22 +653,22 @@ def values_in_date_range(csv_file, date_column, start_date, end_date, target_col
         - The date column values are expected in the format "%m/%d/%Y %H:%M".
         - The start and end dates are inclusive.
         """
-    _validate_csv_and_columns(csv_file, [date_column] + target_columns)
     try:
         results_in_range = []
 
-        with open(csv_file, mode='r', newline='') as file:
-            reader = csv.DictReader(file)
+        with _open_and_validate(csv_file, [date_column] + target_columns) as (header, reader):
             start = datetime.strptime(start_date, "%m/%d/%Y")
             end = datetime.strptime(end_date, "%m/%d/%Y")
+            date_idx = header.index(date_column)
+            target_idxs = [(col, header.index(col)) for col in target_columns]
 
             for row in reader:
-                date_value = row[date_column]
+                date_value = row[date_idx] if date_idx < len(row) else ""
                 if date_value:
                     try:
                         date_obj = datetime.strptime(date_value, "%m/%d/%Y %H:%M")
                         if start <= date_obj <= end:
-                            result = {col: row[col] for col in target_columns}
+                            result = {col: row[i] if i < len(row) else None for col, i in target_idxs}
                             result[date_column] = date_value
                             results_in_range.append(result)
                     except ValueError:
@@ -430,43 +679,119 @@ def values_in_date_range(csv_file, date_column, start_date, end_date, target_col
         raise ValueError(f"The file '{csv_file}' is not a valid CSV file.")
 
 
+def values_in_date_range_pandas(csv_file: str, date_column: str, start_date: str, end_date: str,
+                                target_columns: List[str]) -> List[Dict[str, str]]:
+    """
+        Extract rows from a CSV file where the date falls within a specified range using pyarrow.
+
+        This function reads a CSV file using pyarrow, parses the date column with the Arrow `strptime`
+        kernel and filters the table with Arrow comparison kernels, converting only the matching rows
+        to Python objects. The extracted rows include only the target columns specified.
+
+        Parameters:
+        -----------
+        csv_file : str
+            The path to the CSV file to be processed.
+        date_column : str
+            The name of the column containing the date values.
+        start_date : str
+            The start date for the range in the format "%m/%d/%Y".
+        end_date : str
+            The end date for the range in the format "%m/%d/%Y".
+        target_columns : List[str]
+            The list of additional columns to extract along with the date column.
+
+        Returns:
+        --------
+        List[Dict[str, str]]
+            A list of dictionaries where each dictionary represents a row from the CSV file that falls
+            within the specified date range. Each dictionary contains the date column and the target columns.
+
+        Raises:
+        -------
+        ValueError
+            If the file is not a valid CSV, if the date format is invalid, or if there is an issue with
+            reading the CSV content.
+        FileNotFoundError
+            If the specified CSV file does not exist.
+
+        Notes:
+        ------
+        - The date column values are expected in the format "%m/%d/%Y %H:%M".
+        - The start and end dates are inclusive.
+        """
+    _validate_csv_and_columns(csv_file, [date_column] + target_columns)
+
+    try:
+        start = datetime.strptime(start_date, "%m/%d/%Y")
+        end = datetime.strptime(end_date, "%m/%d/%Y")
+        columns = list(dict.fromkeys(target_columns + [date_column]))
+        table = _read_table(csv_file, columns)
+        table = table.filter(pc.invert(pc.equal(pc.fill_null(table.column(date_column), ""), "")))
+
+        dates = pc.strptime(table.column(date_column), format="%m/%d/%Y %H:%M", unit='s', error_is_null=True)
+        if dates.null_count:
+            date_value = table.column(date_column).filter(pc.is_null(dates))[0].as_py()
+            raise ValueError(f"Invalid date format in column '{date_column}': {date_value}")
+
+        in_range = pc.and_(pc.greater_equal(dates, pa.scalar(start, pa.timestamp('s'))),
+                           pc.less_equal(dates, pa.scalar(end, pa.timestamp('s'))))
+        table = table.filter(in_range)
+        return pa.table({column: pc.fill_null(table.column(column), "") for column in columns}).to_pylist()
+    except pa.ArrowInvalid:
+        raise ValueError(f"The file '{csv_file}' is not a valid CSV file.")
+
+
 if __name__ == "__main__":
     current_dir = os.path.dirname(__file__)
     csv_file = os.path.join(current_dir, "../resources/task1/2017.csv")
 
-    unique_breeds = extract_unique_values(csv_file, "Breed", normalize=True, lowercase=True)
-    print("Unique breeds:", unique_breeds)
+    start_date = "12/25/2016"
+    end_date = "12/31/2016"
+    date_column = "ValidDate"
+    target_columns = ["DogName", "Breed", "LicenseType"]
 
-    unique_breeds_pandas = extract_unique_values_pandas(csv_file, "Breed", normalize=True, lowercase=True)
-    print("Unique breeds using pandas:", unique_breeds_pandas)
+    # The queries are independent of each other, so run them in parallel worker processes.
+    with ProcessPoolExecutor() as executor:
+        unique_breeds = executor.submit(extract_unique_values, csv_file, "Breed", normalize=True, lowercase=True)
+        unique_breeds_pandas = executor.submit(extract_unique_values_pandas, csv_file, "Breed", normalize=True,
+                                               lowercase=True)
+        breed_license_counts = executor.submit(count_by_columns, csv_file, ["Breed", "LicenseType"], normalize=True,
+                                               lowercase=True)
+        breed_license_counts_pandas = executor.submit(count_by_columns_pandas, csv_file, ["Breed", "LicenseType"],
+                                                      normalize=True, lowercase=True)
+        top_dog_names = executor.submit(top_n_values, csv_file, "DogName", n=5, normalize=True, lowercase=False)
+        top_dog_names_pandas = executor.submit(top_n_values_pandas, csv_file, "DogName", n=5, normalize=True,
+                                               lowercase=False)
+        licenses_in_range = executor.submit(values_in_date_range, csv_file, date_column, start_date, end_date,
+                                            target_columns)
+        licenses_in_range_pandas = executor.submit(values_in_date_range_pandas, csv_file, date_column, start_date,
+                                                   end_date, target_columns)
+
+    print("Unique breeds:", unique_breeds.result())
+
+    print("Unique breeds using pandas:", unique_breeds_pandas.result())
 
-    breed_license_counts = count_by_columns(csv_file, ["Breed", "LicenseType"], normalize=True, lowercase=True)
     print("Number of licenses by LicenseType for each unique breed:")
-    for breed_license, count in breed_license_counts.items():
+    for breed_license, count in breed_license_counts.result().items():
         print(f"{breed_license}: {count}")
 
-    breed_license_counts_pandas = count_by_columns_pandas(csv_file, ["Breed", "LicenseType"], normalize=True,
-                                                          lowercase=True)
     print("Number of licenses by LicenseType for each unique breed using pandas:")
-    for breed_license, count in breed_license_counts_pandas.items():
+    for breed_license, count in breed_license_counts_pandas.result().items():
         print(f"{breed_license}: {count}")
 
-    top_dog_names = top_n_values(csv_file, "DogName", n=5, normalize=True, lowercase=False)
     print("Top 5 popular dog names:")
-    for name, count in top_dog_names:
+    for name, count in top_dog_names.result():
         print(f"{name}: {count}")
 
-    top_dog_names_pandas = top_n_values(csv_file, "DogName", n=5, normalize=True, lowercase=False)
     print("Top 5 popular dog names using pandas:")
-    for name, count in top_dog_names_pandas:
+    for name, count in top_dog_names_pandas.result():
         print(f"{name}: {count}")
 
-    start_date = "12/25/2016"
-    end_date = "12/31/2016"
-    date_column = "ValidDate"
-    target_columns = ["DogName", "Breed", "LicenseType"]
-    licenses_in_range = values_in_date_range(csv_file, date_column, start_date, end_date, target_columns)
-
     print("Details of licenses issued between {0} and {1}:".format(start_date, end_date))
-    for license_info in licenses_in_range:
+    for license_info in licenses_in_range.result():
+        print(license_info)
+
+    print("Details of licenses issued between {0} and {1} using pandas:".format(start_date, end_date))
+    for license_info in licenses_in_range_pandas.result():
         print(license_info)
@@ -1,6 +1,7 @@
 import os
 import pandas as pd
-from sqlalchemy import create_engine, Column, Integer, String, Date, Float, Table, MetaData
+from sqlalchemy import create_engine, make_url, Column, Integer, String, Date, Float, Table, MetaData
+from sqlalchemy.exc import OperationalError
 import logging
 import tempfile
 import time
@@ -9,13 +10,37 @@ import sqlite3
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Parse whole files with the multithreaded PyArrow CSV reader when it is installed
+try:
+    import pyarrow  # noqa: F401
+    CSV_ENGINE = 'pyarrow'
+except ImportError:
+    CSV_ENGINE = 'c'
+
+# read_csv options the PyArrow engine does not support
+PYARROW_UNSUPPORTED_OPTIONS = frozenset({
+    'chunksize', 'comment', 'converters', 'dayfirst', 'dialect', 'float_precision', 'iterator', 'lineterminator',
+    'low_memory', 'memory_map', 'nrows', 'quoting', 'skipfooter', 'skipinitialspace', 'thousands'})
+
 
 # Step 1: Extract data from the flat file
 
+# The PyArrow engine cannot stream chunks, rejects some options and reports an empty file as a parser error
+# instead of EmptyDataError, so those reads go through the pandas C parser, as does anything that is not a path
+def _read_csv(file_path, chunksize=None, **kwargs):
+    use_pyarrow = (CSV_ENGINE == 'pyarrow' and chunksize is None and PYARROW_UNSUPPORTED_OPTIONS.isdisjoint(kwargs)
+                   and isinstance(file_path, (str, os.PathLike)) and os.path.getsize(file_path) > 0)
+    if use_pyarrow:
+        return pd.read_csv(file_path, engine='pyarrow', **kwargs)
+    return pd.read_csv(file_path, chunksize=chunksize, **kwargs)
+
+
 # Read the data from the CSV file with better error handling
-def extract_data(file_path):
+# Pass chunksize to get an iterator of DataFrames instead of loading the whole file at once
+# Any other keyword arguments (e.g. dtype) are forwarded to pd.read_csv
+def extract_data(file_path, chunksize=None, **kwargs):
     try:
-        df = pd.read_csv(file_path)
+        df = _read_csv(file_path, chunksize=chunksize, **kwargs)
         logging.info("Data extraction completed successfully.")
         return df
     except FileNotFoundError:
@@ -37,19 +62,21 @@ def transform_data(df):
     for col in string_columns:
         df[col] = df[col].astype(str).str.strip()
 
-    # Convert date_of_birth to datetime format with coercion and error handling
+    # Convert date_of_birth to datetime format and salary to float with coercion and error handling
     df['date_of_birth'] = pd.to_datetime(df['date_of_birth'], format='%Y-%m-%d', errors='coerce')
-    invalid_dates = df['date_of_birth'].isna().sum()
+    df['salary'] = pd.to_numeric(df['salary'], errors='coerce')
+    valid_dates = df['date_of_birth'].notna().to_numpy()
+    valid_salaries = df['salary'].notna().to_numpy()
+    invalid_dates = (~valid_dates).sum()
     if invalid_dates > 0:
         logging.warning(f"{invalid_dates} rows have invalid date_of_birth and will be removed.")
-        df = df[df['date_of_birth'].notna()]
-
-    # Convert salary to float with error handling
-    df['salary'] = pd.to_numeric(df['salary'], errors='coerce')
-    invalid_salaries = df['salary'].isna().sum()
+    invalid_salaries = (valid_dates & ~valid_salaries).sum()
     if invalid_salaries > 0:
         logging.warning(f"{invalid_salaries} rows have invalid salary and will be removed.")
-        df = df[df['salary'].notna()]
+
+    # Drop the invalid rows with a single combined mask instead of one copy per column
+    if invalid_dates or invalid_salaries:
+        df = df[valid_dates & valid_salaries]
     return df
 
 
@@ -82,13 +109,18 @@ def etl_process(engine, file_path):
     logging.info("ETL process completed successfully.")
 
 
-# Database URI
-def get_engine():
-    temp_db = tempfile.NamedTemporaryFile(delete=False)
-    return create_engine(f'sqlite:///{temp_db.name}', connect_args={"timeout": 30})
+# Database URI, defaulting to a temporary SQLite file; pass url to override it (e.g. 'sqlite:///:memory:')
+def get_engine(url=None):
+    if url is None:
+        temp_db = tempfile.NamedTemporaryFile(delete=False)
+        url = f'sqlite:///{temp_db.name}'
+    # The busy timeout is a sqlite3 connect argument; other drivers reject it
+    connect_args = {"timeout": 30} if make_url(url).get_backend_name() == 'sqlite' else {}
+    return create_engine(url, connect_args=connect_args)
 
 
-# Insert with retry logic
+# Insert with retry logic and exponential backoff
+# to_sql runs through SQLAlchemy, which wraps the driver's sqlite3.OperationalError and keeps it in e.orig
 def insert_with_retry(data, engine, retries=3, delay=5):
     for attempt in range(retries):
         try:
@@ -96,12 +128,14 @@ def insert_with_retry(data, engine, retries=3, delay=5):
                 with conn.begin():
                     data.to_sql('departments', con=conn, if_exists='append', index=False)
             return
-        except sqlite3.OperationalError as e:
-            if 'database is locked' in str(e):
-                logging.warning(f"Database is locked, retrying in {delay} seconds...")
-                time.sleep(delay)
-            else:
+        except OperationalError as e:
+            if not (isinstance(e.orig, sqlite3.OperationalError) and 'database is locked' in str(e.orig)):
                 raise
+            # There is nothing left to wait for after the last attempt
+            if attempt < retries - 1:
+                backoff = delay * 2 ** attempt
+                logging.warning(f"Database is locked, retrying in {backoff} seconds...")
+                time.sleep(backoff)
     raise Exception("Failed to insert data after retries due to locked database.")
 
 
@@ -1,8 +1,11 @@
 import csv
 import os
+import shutil
+import tempfile
 import unittest
 
-from csv_processor import extract_unique_values, count_by_columns, top_n_values, values_in_date_range
+from csv_processor import extract_unique_values, count_by_columns, top_n_values, values_in_date_range, \
+    values_in_date_range_pandas, extract_unique_values_pandas, top_n_values_pandas, count_by_columns_pandas
 
 
 class TestCsvProcessor(unittest.TestCase):
@@ -71,6 +74,17 @@ class TestCsvProcessor(unittest.TestCase):
                 unique_values = extract_unique_values(test_csv, column, lowercase=True)
                 self.assertCountEqual(expected_values[column], unique_values)
 
+    def test_extract_all_columns_pandas(self):
+        current_dir = os.path.dirname(__file__)
+        test_csv = os.path.join(current_dir, "../../resources/task1/all_columns.csv")
+
+        with open(test_csv, mode='r', newline='') as file:
+            reader = csv.DictReader(file)
+            for column in reader.fieldnames:
+                expected_values = extract_unique_values(test_csv, column, lowercase=True)
+                unique_values = extract_unique_values_pandas(test_csv, column, lowercase=True)
+                self.assertEqual(expected_values, unique_values)
+
     def test_extract_values_without_normalization(self):
         current_dir = os.path.dirname(__file__)
         test_csv = os.path.join(current_dir, "../../resources/task1/whitespaces.csv")
@@ -90,6 +104,12 @@ class TestCsvProcessor(unittest.TestCase):
         }
         self.assertEqual(expected_data, breed_license_data)
 
+    def test_count_by_columns_short_rows(self):
+        current_dir = os.path.dirname(__file__)
+        test_csv = os.path.join(current_dir, "../../resources/task1/short_rows.csv")
+        breed_data = count_by_columns(test_csv, ['DogName', 'Breed'])
+        self.assertEqual({('CHLOE', 'CHIHUAHUA'): 1}, breed_data)
+
     def test_top_n_values(self):
         current_dir = os.path.dirname(__file__)
         test_csv = os.path.join(current_dir, "../../resources/task1/test_data.csv")
@@ -97,6 +117,12 @@ class TestCsvProcessor(unittest.TestCase):
         expected_top_values = [('DACHSHUND', 5), ('BICHONFRISE', 3), ('GERSHEPHERD', 1)]
         self.assertEqual(expected_top_values, top_values)
 
+    def test_top_n_values_short_rows(self):
+        current_dir = os.path.dirname(__file__)
+        test_csv = os.path.join(current_dir, "../../resources/task1/short_rows.csv")
+        top_values = top_n_values(test_csv, 'Breed', n=3)
+        self.assertEqual([('CHIHUAHUA', 1)], top_values)
+
     def test_values_in_date_range(self):
         current_dir = os.path.dirname(__file__)
         test_csv = os.path.join(current_dir, "../../resources/task1/test_data.csv")
@@ -113,6 +139,96 @@ class TestCsvProcessor(unittest.TestCase):
         results = values_in_date_range(test_csv, date_column, start_date, end_date, target_columns)
         self.assertEqual(expected_results, results)
 
+    def test_values_in_date_range_short_rows(self):
+        current_dir = os.path.dirname(__file__)
+        test_csv = os.path.join(current_dir, "../../resources/task1/short_rows.csv")
+
+        expected_results = [{'DogName': 'REX', 'Breed': None, 'ValidDate': '1/4/2017 8:39'},
+                            {'DogName': 'CHLOE', 'Breed': 'CHIHUAHUA', 'ValidDate': '1/5/2017 9:00'}]
+
+        results = values_in_date_range(test_csv, 'ValidDate', "1/4/2017", "1/6/2017", ['DogName', 'Breed'])
+        self.assertEqual(expected_results, results)
+
+    def test_short_rows_pandas(self):
+        current_dir = os.path.dirname(__file__)
+        test_csv = os.path.join(current_dir, "../../resources/task1/short_rows.csv")
+
+        self.assertEqual(['CHIHUAHUA'], extract_unique_values_pandas(test_csv, 'Breed'))
+        self.assertEqual(count_by_columns(test_csv, ['DogName', 'Breed']),
+                         count_by_columns_pandas(test_csv, ['DogName', 'Breed']))
+        self.assertEqual(top_n_values(test_csv, 'Breed', n=3), top_n_values_pandas(test_csv, 'Breed', n=3))
+
+        expected_results = [{'DogName': 'CHLOE', 'Breed': 'CHIHUAHUA', 'ValidDate': '1/5/2017 9:00'}]
+        results = values_in_date_range_pandas(test_csv, 'ValidDate', "1/4/2017", "1/6/2017", ['DogName', 'Breed'])
+        self.assertEqual(expected_results, results)
+
+    def test_values_in_date_range_pandas(self):
+        current_dir = os.path.dirname(__file__)
+        test_csv = os.path.join(current_dir, "../../resources/task1/test_data.csv")
+        date_column = 'ValidDate'
+        target_columns = ['DogName', 'Breed', 'LicenseType']
+        start_date = "1/4/2017"
+        end_date = "2/4/2017"
+
+        expected_results = values_in_date_range(test_csv, date_column, start_date, end_date, target_columns)
+        results = values_in_date_range_pandas(test_csv, date_column, start_date, end_date, target_columns)
+        self.assertEqual(expected_results, results)
+
+    def test_literal_na_values_pandas(self):
+        current_dir = os.path.dirname(__file__)
+        test_csv = os.path.join(current_dir, "../../resources/task1/na_values.csv")
+
+        unique_values = extract_unique_values_pandas(test_csv, 'DogName', normalize=False)
+        self.assertEqual(['N/A', 'NA', 'NaN', 'null'], unique_values)
+        self.assertEqual(extract_unique_values(test_csv, 'DogName', normalize=False), unique_values)
+
+        top_values = top_n_values_pandas(test_csv, 'DogName', n=2)
+        self.assertEqual(('NA', 2), top_values[0])
+        self.assertEqual(top_n_values(test_csv, 'DogName', n=2), top_values)
+
+        expected_results = values_in_date_range(test_csv, 'ValidDate', "1/4/2017", "1/10/2017", ['DogName'])
+        results = values_in_date_range_pandas(test_csv, 'ValidDate', "1/4/2017", "1/10/2017", ['DogName'])
+        self.assertEqual(expected_results, results)
+        self.assertEqual(['NA', 'null', 'NaN', 'N/A', '', 'NA'], [row['DogName'] for row in results])
+
+    def test_quoted_newlines_pandas(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        test_csv = os.path.join(temp_dir, "dogs.csv")
+
+        # Place a quoted value so that its embedded newline is the last one before the reader's 1 MiB block boundary
+        boundary = (1 << 20) - 5
+        with open(test_csv, mode='w', newline='') as file:
+            size = file.write("A,B\n")
+            index = 0
+            while boundary - size > 20:
+                size += file.write(f"v{index % 99:02d},x\n")
+                index += 1
+            file.write("w" * (boundary - size - 3) + ",x\n")
+            file.write('"v\nline",x\n')
+            for index in range(1000):
+                file.write(f"v{index % 99:02d},x\n")
+
+        count_data = count_by_columns_pandas(test_csv, ['A'], normalize=False)
+        self.assertIn(('v\nline',), count_data)
+        self.assertEqual(count_by_columns(test_csv, ['A'], normalize=False), count_data)
+
+    def test_cache_refreshed_for_replaced_file_pandas(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        test_csv = os.path.join(temp_dir, "dogs.csv")
+
+        with open(test_csv, mode='w', newline='') as file:
+            file.write("DogName,Breed\nCHLOE,CHIHUAHUA\n")
+        self.assertEqual(['CHLOE'], extract_unique_values_pandas(test_csv, 'DogName'))
+
+        # Replace the file with new contents carrying an older modification time, as `cp -p` would
+        mtime_ns = os.stat(test_csv).st_mtime_ns
+        with open(test_csv, mode='w', newline='') as file:
+            file.write("DogName,Breed\nREX,LAB MIX\n")
+        os.utime(test_csv, ns=(mtime_ns - 10 ** 9, mtime_ns - 10 ** 9))
+        self.assertEqual(['REX'], extract_unique_values_pandas(test_csv, 'DogName'))
+
 
 if __name__ == "__main__":
     unittest.main()
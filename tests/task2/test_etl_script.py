@@ -1,69 +1,110 @@
+import io
 import logging
+import os
+import sqlite3
+import tempfile
 import unittest
+from unittest import mock
 
-from sqlalchemy import MetaData, text
+import pandas as pd
+from sqlalchemy import MetaData, create_engine, select, func
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker
 
 from etl_script import transform_data, load_data, get_engine, extract_data, insert_with_retry
 
+CHUNK_SIZE = 100_000
+# Column types of the flat file, declared up front to skip type inference
+DTYPES = {'id': 'int64', 'name': 'str', 'date_of_birth': 'str', 'salary': 'float64', 'department_id': 'str'}
 
-class TestETLProcess(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        # Create a connection and cleanup the database before running tests
-        cls.engine = get_engine()
-        cls.connection = cls.engine.connect()
-        cls.metadata = MetaData()
-        cls.metadata.reflect(bind=cls.engine)
-        for table in reversed(cls.metadata.sorted_tables):
-            cls.connection.execute(table.delete())
-        logging.info("Database cleaned up before running unit tests.")
-
-    @classmethod
-    def tearDownClass(cls):
-        # Close the connection after all tests are done
-        cls.connection.close()
-        logging.info("Database connection closed after unit tests.")
 
-    def setUp(self):
-        # Ensure tests run one by one
-        self.engine = self.__class__.engine
-        self.connection = self.__class__.connection
-        self.metadata = self.__class__.metadata
+def iter_chunks(file_path):
+    # Stream the flat file and transform it chunk by chunk, keeping memory bounded by CHUNK_SIZE
+    for chunk in extract_data(file_path, chunksize=CHUNK_SIZE, dtype=DTYPES, skipinitialspace=True):
+        yield transform_data(chunk)
 
-    def test_employees_table(self):
-        # Load test data
-        df = extract_data("../resources/task2/employees.csv")
-        df = transform_data(df)
+
+class TestETLProcess(unittest.TestCase):
+    def setUp(self):
+        # Give each test its own in-memory database so tests do not interfere and can run in parallel
+        self.engine = get_engine(url='sqlite:///:memory:')
         load_data(self.engine)
+        self.metadata = MetaData()
+        self.metadata.reflect(bind=self.engine)
 
-        # Insert transformed data
-        df.to_sql('employees', con=self.engine, if_exists='append', index=False)
+        # Build the count queries against this test's schema
+        self.Session = sessionmaker(bind=self.engine)
+        self.count_employees = select(func.count()).select_from(self.metadata.tables['employees'])
+        self.count_departments = select(func.count()).select_from(self.metadata.tables['departments'])
+
+    def tearDown(self):
+        # Dispose of the engine, which discards the in-memory database
+        self.engine.dispose()
+
+    def test_employees_table(self):
+        # Load test data and insert it chunk by chunk as plain row tuples, committing once at the end
+        employees = self.metadata.tables['employees']
+        with self.engine.begin() as conn:
+            for chunk in iter_chunks("../resources/task2/employees.csv"):
+                columns = list(chunk.columns)
+                conn.execute(employees.insert(),
+                             [dict(zip(columns, row)) for row in chunk.itertuples(index=False, name=None)])
 
         # Check employees table
-        Session = sessionmaker(bind=self.engine)
-        session = Session()
-        result = session.execute(text("SELECT COUNT(*) FROM employees")).scalar()
+        with self.Session() as session:
+            result = session.execute(self.count_employees).scalar()
         self.assertGreater(result, 0, "Employees table should not be empty after ETL process.")
         logging.info("Employees table has been populated successfully.")
 
     def test_departments_table(self):
-        # Load test data
-        df = extract_data("../resources/task2/employees.csv")
-        df = transform_data(df)
-        load_data(self.engine)
+        # Load test data, collecting the unique department ids across chunks
+        department_ids = {}
+        for chunk in iter_chunks("../resources/task2/employees.csv"):
+            department_ids.update(dict.fromkeys(pd.unique(chunk['department_id'].to_numpy())))
 
         # Insert transformed data
-        unique_departments = df[['department_id']].drop_duplicates().reset_index(drop=True)
-        unique_departments['department_name'] = unique_departments['department_id'].apply(lambda x: f'Department {x}')
-        insert_with_retry(unique_departments, self.engine)
+        unique_departments = pd.DataFrame({'department_id': list(department_ids)})
+        unique_departments['department_name'] = 'Department ' + unique_departments['department_id'].astype(str)
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(self.metadata.tables['departments'].insert(),
+                             unique_departments.to_dict(orient='records'))
+        except OperationalError:
+            # Fall back to the retrying loader if the database is locked
+            insert_with_retry(unique_departments, self.engine)
 
         # Check departments table
-        Session = sessionmaker(bind=self.engine)
-        session = Session()
-        result = session.execute(text("SELECT COUNT(*) FROM departments")).scalar()
+        with self.Session() as session:
+            result = session.execute(self.count_departments).scalar()
         self.assertGreater(result, 0, "Departments table should not be empty after ETL process.")
         logging.info("Departments table has been populated successfully.")
 
+    def test_extract_data_from_buffer(self):
+        # extract_data accepts anything pd.read_csv does, not only file paths
+        df = extract_data(io.StringIO("id,name\n1,Alice\n"))
+        self.assertEqual(['id', 'name'], list(df.columns))
+        self.assertEqual(1, len(df))
+        logging.info("Data has been extracted from an in-memory buffer successfully.")
+
+    def test_insert_with_retry_backs_off_while_locked(self):
+        # Hold an exclusive lock on a file database so every insert attempt fails with "database is locked"
+        temp_db = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        temp_db.close()
+        self.addCleanup(os.remove, temp_db.name)
+        engine = create_engine(f'sqlite:///{temp_db.name}', connect_args={"timeout": 0})
+        self.addCleanup(engine.dispose)
+        load_data(engine)
+        locker = sqlite3.connect(temp_db.name)
+        self.addCleanup(locker.close)
+        locker.execute("BEGIN EXCLUSIVE")
+
+        departments = pd.DataFrame({'department_id': ['D001'], 'department_name': ['Department D001']})
+        with mock.patch('etl_script.time.sleep') as sleep:
+            with self.assertRaisesRegex(Exception, "Failed to insert data after retries"):
+                insert_with_retry(departments, engine, retries=3, delay=1)
+        self.assertEqual([mock.call(1), mock.call(2)], sleep.call_args_list)
+        logging.info("Insert retried with exponential backoff while the database was locked.")
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -1,96 +1,195 @@
 import unittest
 import logging
-
-from sqlalchemy import text, MetaData
-from sqlalchemy.orm import sessionmaker
-
-from from_flat_file import insert_with_retry, extract_data, transform_data, load_new_data, get_engine
+import hashlib
+import inspect
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pandas as pd
+from sqlalchemy import text, MetaData, select, func
+from sqlalchemy.exc import OperationalError, IntegrityError
+
+from from_flat_file import extract_data, transform_data, load_new_data, get_engine, insert_with_retry
+
+# Mapping from the flat file columns to the new employees table schema
+EMPLOYEE_COLUMNS = {'id': 'emp_id', 'name': 'full_name', 'date_of_birth': 'dob'}
+# Column types of the flat file, declared up front to skip type inference
+DTYPES = {'id': 'int64', 'name': 'str', 'date_of_birth': 'str', 'salary': 'float64', 'department_id': 'str'}
+# Tables the pickled schema snapshot must hold to be reused
+SCHEMA_TABLES = ('employees', 'departments')
+# Snapshot directory; the snapshot is opt-in and disabled unless this is set to a directory only you can write to
+METADATA_CACHE_DIR = os.environ.get('RAKUTEN_TESTS_METADATA_CACHE_DIR', '')
+METADATA_CACHE_TTL = float(os.environ.get('RAKUTEN_TESTS_METADATA_TTL', 3600))
+
+
+def clean_database(engine, metadata):
+    # Empty all tables in a single transaction; PostgreSQL can truncate them in one statement
+    tables = [table.name for table in metadata.sorted_tables]
+    if not tables:
+        return
+    with engine.begin() as conn:
+        if engine.dialect.name == 'postgresql':
+            conn.execute(text(f"TRUNCATE {', '.join(tables)} RESTART IDENTITY CASCADE"))
+        else:
+            for table in reversed(metadata.sorted_tables):
+                conn.execute(table.delete())
+
+
+def _metadata_cache_path(engine):
+    # Key on the database URL and the schema DDL; temporary SQLite files get a new path per run, so key on the driver
+    url = engine.url.drivername if engine.dialect.name == 'sqlite' else engine.url.render_as_string()
+    key = hashlib.sha1((url + inspect.getsource(load_new_data)).encode()).hexdigest()
+    return os.path.join(METADATA_CACHE_DIR, f"meta_{key}.pkl")
+
+
+def reflect_metadata(engine):
+    # Load the reflected schema from the pickled snapshot while it is fresh, otherwise reflect and store it
+    if not METADATA_CACHE_DIR:
+        metadata = MetaData()
+        metadata.reflect(bind=engine)
+        return metadata
+
+    path = _metadata_cache_path(engine)
+    if os.path.exists(path) and time.time() - os.path.getmtime(path) < METADATA_CACHE_TTL:
+        try:
+            with open(path, 'rb') as f:
+                metadata = pickle.load(f)
+            if all(name in metadata.tables for name in SCHEMA_TABLES):
+                return metadata
+        except Exception:
+            # Unreadable snapshot, e.g. pickled by another SQLAlchemy version
+            pass
+        invalidate_metadata(engine)
+
+    metadata = MetaData()
+    metadata.reflect(bind=engine)
+    try:
+        os.makedirs(METADATA_CACHE_DIR, mode=0o700, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=METADATA_CACHE_DIR, suffix='.tmp')
+    except OSError:
+        return metadata
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(metadata, f)
+        os.replace(tmp_path, path)
+    except (OSError, pickle.PicklingError):
+        os.remove(tmp_path)
+    return metadata
+
+
+def invalidate_metadata(engine):
+    # Drop the pickled snapshot so the next run reflects the schema again
+    if not METADATA_CACHE_DIR:
+        return
+    try:
+        os.remove(_metadata_cache_path(engine))
+    except FileNotFoundError:
+        pass
 
 
 class TestETLProcessTask3(unittest.TestCase):
-    def setUp(self):
-        # Create a connection and clean up the database before running each test
-        self.engine = get_engine()
-        self.connection = self.engine.connect()
-        self.metadata = MetaData()
-        self.metadata.reflect(bind=self.engine)
-        for table in reversed(self.metadata.sorted_tables):
-            self.connection.execute(table.delete())
-        logging.getLogger().info("Database cleaned up before running unit test for Task 3.")
-
-    def tearDown(self):
-        # Close the connection after each test
-        self.connection.close()
-        logging.getLogger().info("Database connection closed after unit test for Task 3.")
+    @classmethod
+    def setUpClass(cls):
+        # Create a connection, extract and transform the test data and create the schema once for all tests
+        cls.engine = get_engine()
+        cls.connection = cls.engine.connect()
+        cls.df = transform_data(extract_data("../resources/task3/employees.csv", dtype=DTYPES))
+        load_new_data(cls.engine)
+        cls.metadata = reflect_metadata(cls.engine)
+
+        # Build the count queries once so their compiled form is cached and reused
+        cls.count_employees = select(func.count()).select_from(cls.metadata.tables['employees'])
+        cls.count_departments = select(func.count()).select_from(cls.metadata.tables['departments'])
+
+    @classmethod
+    def tearDownClass(cls):
+        # Close the connection after all tests are done
+        cls.connection.close()
+        logging.getLogger().info("Database connection closed after unit tests for Task 3.")
 
     def setUp(self):
-        # Ensure tests run one by one
-        self.engine = self.__class__.engine
-        self.connection = self.__class__.connection
-        self.metadata = self.__class__.metadata
-
-    def test_employees_table(self):
-        # Load test data
-        df = extract_data("../resources/task3/employees.csv")
-        df = transform_data(df)
-        load_new_data(self.engine)
-
-        # Insert transformed data
-        employees_data = df.rename(columns={'id': 'emp_id', 'name': 'full_name', 'date_of_birth': 'dob'})
-        employees_data.to_sql('employees', con=self.engine, if_exists='append', index=False)
-
-        # Check employees table
-        Session = sessionmaker(bind=self.engine)
-        session = Session()
-        result = session.execute(text("SELECT COUNT(*) FROM employees")).scalar()
-        self.assertGreater(result, 0, "Employees table should not be empty after ETL process for Task 3.")
-        logging.getLogger().info("Employees table for Task 3 has been populated successfully.")
-
-    def test_departments_table(self):
-        # Load test data
-        df = extract_data("../resources/task3/employees.csv")
-        df = transform_data(df)
-        load_new_data(self.engine)
-
-        # Insert transformed data
-        unique_departments = df[['department_id']].drop_duplicates().reset_index(drop=True)
-        unique_departments.rename(columns={'department_id': 'dept_id'}, inplace=True)
-        unique_departments['dept_name'] = unique_departments['dept_id'].apply(lambda x: f'Department {x}')
-        insert_with_retry(unique_departments, self.engine)
+        # Engine, connection and metadata are shared from setUpClass; only empty the tables before each test
+        try:
+            clean_database(self.engine, self.metadata)
+        except OperationalError:
+            # The cached schema no longer matches the database
+            invalidate_metadata(self.engine)
+            raise
+        logging.getLogger().info("Database cleaned up before running unit test for Task 3.")
 
-        # Check departments table
-        Session = sessionmaker(bind=self.engine)
-        session = Session()
-        result = session.execute(text("SELECT COUNT(*) FROM departments")).scalar()
-        self.assertGreater(result, 0, "Departments table should not be empty after ETL process for Task 3.")
-        logging.getLogger().info("Departments table for Task 3 has been populated successfully.")
-
-    def test_data_validation(self):
-        # Load test data
-        df = extract_data("../resources/task3/employees.csv")
-        df = transform_data(df)
-        load_new_data(self.engine)
-
-        # Insert transformed data
-        employees_data = df.rename(columns={'id': 'emp_id', 'name': 'full_name', 'date_of_birth': 'dob'})
-        employees_data.to_sql('employees', con=self.engine, if_exists='append', index=False)
-
-        unique_departments = df[['department_id']].drop_duplicates().reset_index(drop=True)
-        unique_departments.rename(columns={'department_id': 'dept_id'}, inplace=True)
-        unique_departments['dept_name'] = unique_departments['dept_id'].apply(lambda x: f'Department {x}')
+    def test_full_etl(self):
+        # Transformed test data is shared from setUpClass, so the flat file is parsed only once
+        df = self.__class__.df
+
+        # Insert employees and departments in the same transaction, feeding plain row tuples to Core inserts
+        employee_columns = [EMPLOYEE_COLUMNS.get(col, col) for col in df.columns]
+        employees = [dict(zip(employee_columns, row)) for row in df.itertuples(index=False, name=None)]
+        unique_departments = pd.DataFrame({'dept_id': pd.unique(df['department_id'].to_numpy())})
+        unique_departments['dept_name'] = 'Department ' + unique_departments['dept_id'].astype(str)
+        with self.engine.begin() as conn:
+            conn.execute(self.metadata.tables['employees'].insert(), employees)
+            conn.execute(self.metadata.tables['departments'].insert(), unique_departments.to_dict(orient='records'))
+
+        # Validate data, running the independent count queries concurrently on their own pooled connections
+        def run_query(query):
+            with self.engine.connect() as conn:
+                return conn.execute(query).scalar()
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            joined_count = executor.submit(run_query, text("""
+                SELECT COUNT(*)
+                FROM employees e
+                JOIN departments d ON e.department_id = d.dept_id
+            """))
+            employees_count = executor.submit(run_query, self.__class__.count_employees)
+            departments_count = executor.submit(run_query, self.__class__.count_departments)
+
+        self.assertGreater(employees_count.result(), 0,
+                           "Employees table should not be empty after ETL process for Task 3.")
+        self.assertGreater(departments_count.result(), 0,
+                           "Departments table should not be empty after ETL process for Task 3.")
+        self.assertEqual(joined_count.result(), len(df),
+                         "Data validation failed: Mismatch between flat file and database records.")
+        self.assertEqual(employees_count.result(), len(df),
+                         "Data validation failed: Mismatch between flat file and employees table.")
+        self.assertEqual(departments_count.result(), len(unique_departments),
+                         "Data validation failed: Mismatch between flat file and departments table.")
+        logging.getLogger().info("ETL process and data validation for Task 3 completed successfully.")
+
+    def test_insert_with_retry(self):
+        # Insert the unique departments through the retrying loader and check the table
+        unique_departments = pd.DataFrame({'dept_id': pd.unique(self.df['department_id'].to_numpy())})
+        unique_departments['dept_name'] = 'Department ' + unique_departments['dept_id'].astype(str)
         insert_with_retry(unique_departments, self.engine)
 
-        # Validate data
-        Session = sessionmaker(bind=self.engine)
-        session = Session()
-        result = session.execute(text("""
-            SELECT e.emp_id, e.full_name, e.dob, e.salary, e.department_id, d.dept_name
-            FROM employees e
-            JOIN departments d ON e.department_id = d.dept_id
-        """)).fetchall()
-        self.assertEqual(len(result), len(df),
-                         "Data validation failed: Mismatch between flat file and database records.")
-        logging.getLogger().info("Data validation for Task 3 completed successfully.")
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(self.count_departments).scalar(), len(unique_departments),
+                             "Departments table should hold every department inserted with retry for Task 3.")
+
+        # Errors other than a locked database are raised as SQLAlchemy exceptions without retrying
+        with self.assertRaises(IntegrityError):
+            insert_with_retry(unique_departments, self.engine)
+        logging.getLogger().info("Departments for Task 3 have been inserted with retry successfully.")
+
+    def test_reflect_metadata_replaces_bad_snapshot(self):
+        # A snapshot that cannot be unpickled or lacks the schema tables is deleted and the schema reflected again
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        with mock.patch(f'{__name__}.METADATA_CACHE_DIR', cache_dir):
+            path = _metadata_cache_path(self.engine)
+            for snapshot in (b'not a pickle', pickle.dumps(MetaData())):
+                with open(path, 'wb') as f:
+                    f.write(snapshot)
+                metadata = reflect_metadata(self.engine)
+                self.assertCountEqual(SCHEMA_TABLES, metadata.tables)
+                with open(path, 'rb') as f:
+                    self.assertCountEqual(SCHEMA_TABLES, pickle.load(f).tables)
+        logging.getLogger().info("Bad schema snapshot for Task 3 has been replaced successfully.")
 
 
 if __name__ == '__main__':